@@ -14,13 +14,16 @@ and support a consistent system state.
 # pylint: disable=line-too-long
 # pylint: disable=invalid-name
 
+import math
+import threading
 import time
 from datetime import datetime
 from functools import wraps
 from typing import Any, Callable, cast, Literal
 import mysql.connector
+from mysql.connector.constants import ClientFlag
 from mysql.connector.pooling import PooledMySQLConnection
-from mysql.connector.abstracts import MySQLConnectionAbstract
+from mysql.connector.abstracts import MySQLConnectionAbstract, MySQLCursorAbstract
 
 # ---------------- CONFIG ----------------
 # Must be set via args
@@ -40,6 +43,8 @@ REPOINT_RETRIES: int = 2
 REPOINT_RETRY_DELAY: float = 4 # seconds
 MASTER_ONLINE_RETIRES: int = 2
 MASTER_ONLINE_RETRY_DELAY: float = 4 # seconds
+LAG_CACHE_TTL: float = 10 # seconds
+MASTER_CACHE_TTL: float = 2 # seconds
 
 # Are not set via args
 WRITE_HG: int = 10
@@ -48,6 +53,8 @@ BROKEN_HG: int = 30
 NODE_LIST: list[str] = []
 NODE_STATUS: dict[str, str] = {}
 QUORUM: int = -1
+PINGERS: dict[str, PooledMySQLConnection | MySQLConnectionAbstract] = {}
+PINGERS_LOCK = threading.Lock()
 
 # ---------------- HELPERS ----------------
 def keeptrying(interval: float, max_retry_count: int | None = None):
@@ -98,18 +105,83 @@ def keeptrying(interval: float, max_retry_count: int | None = None):
         return wrapper
     return decorator
 
-def mysql_connect(host: str, user: str, password: str, port: int = 3306) -> PooledMySQLConnection | MySQLConnectionAbstract | None:
+def ttl_cache(ttl: float):
+    """
+    Decorator that memoizes a function's result per positional arguments for `ttl` seconds.
+    A None result means the lookup failed, so it is not cached and the next call retries.
+
+    The wrapped function gets a `cache_clear()` attribute that drops every cached entry,
+    for callers that know the underlying state has changed.
+
+    Args:
+        ttl (float): Seconds a cached result stays valid.
+    """
+    def decorator(func):
+        cache: dict[tuple[Any, ...], tuple[float, Any]] = {}
+        @wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            hit = cache.get(args)
+            if hit is not None and now - hit[0] < ttl:
+                return hit[1]
+            result = func(*args)
+            if result is not None:
+                cache[args] = (now, result)
+            return result
+        wrapper.cache_clear = cache.clear # type: ignore[attr-defined]
+        return wrapper
+    return decorator
+
+def mysql_connect(host: str, user: str, password: str, port: int = 3306, multi_statements: bool = False, io_timeout: int | None = None) -> PooledMySQLConnection | MySQLConnectionAbstract | None:
+    """
+    Opens a connection, or returns None if the node cannot be reached.
+    MULTI_STATEMENTS is one of the connector's default client flags, so it is cleared
+    explicitly unless `multi_statements` is set by a caller that uses execute_multi.
+    `io_timeout` bounds every later read and write in whole seconds; connection_timeout
+    only bounds the connect itself.
+    """
+    client_flags = [ClientFlag.MULTI_STATEMENTS] if multi_statements else [-ClientFlag.MULTI_STATEMENTS]
     try:
-        return mysql.connector.connect(host=host, user=user, password=password, port=port, connection_timeout=CONNECTION_TIMEOUT)
+        return mysql.connector.connect(host=host, user=user, password=password, port=port, connection_timeout=CONNECTION_TIMEOUT, client_flags=client_flags, read_timeout=io_timeout, write_timeout=io_timeout)
     except mysql.connector.Error:
         return None
 
+def execute_multi(cursor: MySQLCursorAbstract, statements: str, params: tuple[Any, ...] = ()) -> None:
+    """
+    Sends several `;`-separated statements to the server in a single round-trip
+    and drains every result set so the connection can be reused afterwards.
+    """
+    cursor.execute(statements, params)
+    while cursor.nextset():
+        pass
+
 def is_online(host: str) -> bool:
-    conn = mysql_connect(host, MYSQL_USER, MYSQL_PASS)
-    if conn:
-        conn.close()
+    """
+    Checks liveness with a COM_PING over a persistent per-node connection.
+
+    The connection is opened on first use and kept in PINGERS for the lifetime of the
+    process. A failed ping may only mean the connection went stale (wait_timeout, a
+    network blip), so it is replaced by a fresh connection before the node counts as down.
+    Pings on the kept connection time out after CONNECTION_TIMEOUT like a fresh connect does,
+    so a partitioned node cannot stall the monitor loop while PINGERS_LOCK is held.
+    """
+    with PINGERS_LOCK:
+        conn = PINGERS.get(host)
+        if conn is not None:
+            try:
+                conn.ping(reconnect=False)
+                return True
+            except (mysql.connector.InterfaceError, mysql.connector.OperationalError):
+                del PINGERS[host]
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        conn = mysql_connect(host, MYSQL_USER, MYSQL_PASS, io_timeout=max(1, math.ceil(CONNECTION_TIMEOUT)))
+        if not conn:
+            return False
+        PINGERS[host] = conn
         return True
-    return False
 
 def get_gtid(host: str) -> str:
     conn = mysql_connect(host, MYSQL_USER, MYSQL_PASS)
@@ -194,23 +266,20 @@ def set_proxysql_node_status(selected_node: str, node_status: Literal["alive", "
 def update_proxysql_write(master_host: str) -> bool:
     """Set all nodes to read-only, then chosen master to write. Returns True on success."""
     print(f"[INFO] Updating ProxySQL: all nodes read-only, {master_host} write")
-    conn = mysql_connect(PROXYSQL_NODE, PROXYSQL_ADMIN, PROXYSQL_PASS, port=6032)
+    conn = mysql_connect(PROXYSQL_NODE, PROXYSQL_ADMIN, PROXYSQL_PASS, port=6032, multi_statements=True)
     if not conn:
         print("[ERROR] Cannot connect to ProxySQL")
         return False
     try:
         cursor = conn.cursor()
-
-        cursor.execute("BEGIN;")
-        cursor.execute("DELETE FROM mysql_servers WHERE hostgroup_id = %s;", (WRITE_HG,))
-        cursor.execute("""
-            INSERT INTO mysql_servers (hostgroup_id, hostname, port)
-            VALUES (%s, %s, %s);
-        """, (WRITE_HG, master_host, 3306))
-        cursor.execute("COMMIT;")
-        
-        cursor.execute("LOAD MYSQL SERVERS TO RUNTIME;")
-        cursor.execute("SAVE MYSQL SERVERS TO DISK;")
+        execute_multi(cursor, """
+            BEGIN;
+            DELETE FROM mysql_servers WHERE hostgroup_id = %s;
+            INSERT INTO mysql_servers (hostgroup_id, hostname, port) VALUES (%s, %s, %s);
+            COMMIT;
+            LOAD MYSQL SERVERS TO RUNTIME;
+            SAVE MYSQL SERVERS TO DISK;
+        """, (WRITE_HG, WRITE_HG, master_host, 3306))
 
         conn.commit()
         return True
@@ -301,24 +370,25 @@ def handle_promotion(master_node: str) -> None:
             conn.commit()
         finally:
             conn.close()
+    invalidate_lag()
 
 def _point_to_master(selected_node: str, master: str) -> int:
     print(f"[INFO] Pointing {selected_node} to master {master}...")
-    conn = mysql_connect(selected_node, MYSQL_USER, MYSQL_PASS)
+    conn = mysql_connect(selected_node, MYSQL_USER, MYSQL_PASS, multi_statements=True)
     if not conn:
         print(f"[WARN] Cannot connect to {selected_node}")
         return 1
     try:
         cursor = conn.cursor(dictionary=True)
-        cursor.execute("STOP SLAVE;")
-        cursor.execute(f"""
+        execute_multi(cursor, """
+            STOP SLAVE;
             CHANGE MASTER TO
-              MASTER_HOST='{master}',
-              MASTER_USER='{MYSQL_USER}',
-              MASTER_PASSWORD='{MYSQL_PASS}',
+              MASTER_HOST=%s,
+              MASTER_USER=%s,
+              MASTER_PASSWORD=%s,
               MASTER_AUTO_POSITION=1;
-        """)
-        cursor.execute("START SLAVE;")
+            START SLAVE;
+        """, (master, MYSQL_USER, MYSQL_PASS))
 
         time.sleep(SLEEP_INTERVAL)
 
@@ -346,6 +416,7 @@ def attempt_repoint(selected_node: str, master: str) -> int:
             break
         print(f"[WARN] Failed to point {selected_node} to {master}. Retrying... ({i+1}/{REPOINT_RETRIES})")
         time.sleep(REPOINT_RETRY_DELAY)
+    invalidate_lag()
     return last_res
 
 @keeptrying(interval=SLEEP_INTERVAL)
@@ -406,6 +477,7 @@ def latest_replica() -> str | None:
     print("[WARN] Could not determine a single most advanced replica via GTID sets. Data may have diverged.")
     return max(contenders, key=cast(Callable[[str], str], contenders.get))
 
+@ttl_cache(MASTER_CACHE_TTL)
 def choose_master():
     proxysql_master = get_master_from_proxysql()
     if proxysql_master and proxysql_master in NODE_LIST:
@@ -429,6 +501,7 @@ def choose_master():
         candidate_gtids = {n: g for n, g in NODE_GTIDS.items() if n in candidates}
         return max(candidate_gtids, key=candidate_gtids.get)
 
+@ttl_cache(LAG_CACHE_TTL)
 def get_lag_hours(selected_node: str) -> float | None:
     try:
         conn = mysql_connect(selected_node, MYSQL_USER, MYSQL_PASS)
@@ -444,6 +517,15 @@ def get_lag_hours(selected_node: str) -> float | None:
         print(f"[ERROR] Failed to get lag hours for {selected_node} due to an error: {e}")
     return None
 
+def invalidate_master() -> None:
+    """Drops the cached master choice after a node's NODE_STATUS changes."""
+    choose_master.cache_clear() # type: ignore[attr-defined]
+
+def invalidate_lag() -> None:
+    """Drops cached replication lag and master choice after a promotion or repoint."""
+    get_lag_hours.cache_clear() # type: ignore[attr-defined]
+    invalidate_master()
+
 def select_dump_source(selected_node):
     master = choose_master()
     for n in NODE_LIST:
@@ -513,6 +595,7 @@ while True:
             if NODE_STATUS.get(node) == "offline":
                 print(f"[INFO] Node {node} is back online")
                 NODE_STATUS[node] = "online"
+                invalidate_master()
                 while not set_proxysql_node_status(node, NODE_STATUS[node]):
                     print(f"Could not update {node} status in ProxySQL. Retrying.")
                     time.sleep(SMALL_INTERVAL)
@@ -524,6 +607,7 @@ while True:
                 while not set_proxysql_node_status(node, "offline"):
                     print(f"Could not update {node} status in ProxySQL. Retrying.")
                     time.sleep(SMALL_INTERVAL)
+                invalidate_master()
             NODE_STATUS[node] = "offline"
     for node in need_rebuild:
         update_proxysql_broken(node)
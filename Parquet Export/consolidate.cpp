@@ -2,20 +2,30 @@
 #include <unordered_map>
 #include <unordered_set>
 #include <vector>
+#include <algorithm>
 #include <string>
+#include <string_view>
 #include <cstdint>
 #include <cstring>
+#include <cstdio>
+#include <charconv>
+#include <system_error>
 #include <arrow/io/api.h>
 #include <arrow/table.h>
 #include <arrow/array.h>
 #include <arrow/builder.h>
 #include <parquet/arrow/reader.h>
 #include <parquet/arrow/writer.h>
+#include <parquet/metadata.h>
+#include <parquet/statistics.h>
 #include <date/date.h>
 #include <chrono>
 #include <thread>
+#include <mutex>
+#include <atomic>
+#include <exception>
 #include <filesystem>
-#include <optional>
+#include <unistd.h>
 
 #define ARROW_CHECK_OK(status)                                         \
   do {                                                                 \
@@ -26,15 +36,20 @@
   } while (0)
 
 
+// Day files are written from several threads; keeps their log lines whole.
+std::mutex log_mutex;
+
+// The primary key is the key of every map holding a Change, so it is not stored again;
+// fields run from widest to narrowest so the struct packs into 40 bytes without padding holes.
 struct Change {
-    char dt[20];      // 'YYYY-MM-DD HH:MM:SS' in UTC+2
     double val;       // Numeric for non-NULL, use nan for NULL
     uint64_t ts;      // Unix timestamp
+    char dt[20];      // 'YYYY-MM-DD HH:MM:SS' in UTC+2
     bool val_is_null; // Flag for NULL value
-    int64_t pk;      // Primary key
 };
 
-std::string trim(const std::string& str) {
+// Returns a view into `str`, so trimming never allocates.
+std::string_view trim(std::string_view str) {
     size_t start = 0;
     while (start < str.size() && (str[start] == ' ' || str[start] == '\t')) ++start;
     size_t end = str.size();
@@ -42,14 +57,19 @@ std::string trim(const std::string& str) {
     return str.substr(start, end - start);
 }
 
-std::string ts_to_utc2(uint64_t ts) {
-    auto tp = std::chrono::system_clock::from_time_t(ts);
+// Formats with calendar arithmetic and one snprintf, instead of date::format's stream machinery per row.
+// Writes the 19 characters into `buf`, so appending a change never allocates a string.
+std::string_view ts_to_utc2(uint64_t ts, char (&buf)[32]) {
+    auto tp = std::chrono::time_point_cast<std::chrono::seconds>(std::chrono::system_clock::from_time_t(ts));
     auto offset_tp = tp + std::chrono::hours(2);
-    auto formatted = date::format("%F %T", offset_tp);
-    if (formatted.size() > 19) {
-        formatted = formatted.substr(0, 19);
-    }
-    return formatted;
+    auto day_point = date::floor<date::days>(offset_tp);
+    date::year_month_day ymd{day_point};
+    date::hh_mm_ss<std::chrono::seconds> hms{offset_tp - day_point};
+    std::snprintf(buf, sizeof(buf), "%04d-%02u-%02u %02d:%02d:%02d",
+                  static_cast<int>(ymd.year()), static_cast<unsigned>(ymd.month()), static_cast<unsigned>(ymd.day()),
+                  static_cast<int>(hms.hours().count()), static_cast<int>(hms.minutes().count()),
+                  static_cast<int>(hms.seconds().count()));
+    return std::string_view(buf, 19);
 }
 
 // MODIFICATION: Function signature updated to handle separate insert/update maps.
@@ -64,10 +84,12 @@ inline void process_block(char type, int64_t pk, const std::string& dt,
     if (type != 'D' && ts == 0) throw std::runtime_error("Invalid event: Timestamp (ts) is 0 for INSERT/UPDATE on pk " + std::to_string(pk));
 
     std::string day = dt.substr(0, 10);
+    // Resolve the day's insert map once per event instead of hashing the day key on every access.
+    auto& day_inserts = inserts_by_day[day];
 
     // MODIFICATION: Delete logic now cleans up from both insert and update maps.
     if (type == 'D') {
-        inserts_by_day[day].erase(pk);
+        day_inserts.erase(pk);
         updates_by_day[day].erase(pk);
         deleted_by_day[day].insert(pk);
         return;
@@ -78,15 +100,14 @@ inline void process_block(char type, int64_t pk, const std::string& dt,
     if (val_raw == "NULL") {
         val_is_null = true;
     } else {
-        try {
-            val = std::stod(val_raw);
-        } catch (const std::exception& e) {
-            throw std::runtime_error("Failed to parse value '" + val_raw + "' for pk " + std::to_string(pk) + ". Details: " + e.what());
+        // from_chars parses in place without the locale lookup and exception setup of std::stod.
+        auto [ptr, ec] = std::from_chars(val_raw.data(), val_raw.data() + val_raw.size(), val);
+        if (ec != std::errc()) {
+            throw std::runtime_error("Failed to parse value '" + val_raw + "' for pk " + std::to_string(pk) + ". Details: " + std::make_error_code(ec).message());
         }
     }
 
     Change change;
-    change.pk = pk;
     change.val = val;
     change.val_is_null = val_is_null;
     change.ts = ts;
@@ -95,12 +116,13 @@ inline void process_block(char type, int64_t pk, const std::string& dt,
 
     // MODIFICATION: New stateful logic to separate inserts from updates.
     if (type == 'I') {
-        inserts_by_day[day][pk] = change;
+        day_inserts[pk] = change;
     } else if (type == 'U') {
         // Check if this PK was already inserted in this batch.
-        if (inserts_by_day[day].count(pk) > 0) {
+        auto insert_it = day_inserts.find(pk);
+        if (insert_it != day_inserts.end()) {
             // If so, update the entry in the inserts map.
-            inserts_by_day[day][pk] = change;
+            insert_it->second = change;
         } else {
             // Otherwise, it's an update to a pre-existing row.
             updates_by_day[day][pk] = change;
@@ -127,16 +149,38 @@ void update_parquet_file(const std::string& day,
     auto ts_field = arrow::field("ts", arrow::utf8());
     auto schema = arrow::schema({id_field, dt_field, value_field, ts_field});
 
-    struct RowData {
-        std::string dt;
-        std::optional<double> value;
-        std::string ts;
-    };
-    std::unordered_map<int64_t, RowData> in_memory_table;
-
     arrow::MemoryPool* pool = arrow::default_memory_pool();
     bool file_exists = std::filesystem::exists(file_path);
     size_t previous_row_count = 0;
+    size_t applied_deletes = 0;
+    size_t applied_updates = 0;
+
+    arrow::Int64Builder id_builder;
+    arrow::StringBuilder dt_builder, ts_builder;
+    arrow::DoubleBuilder value_builder;
+
+    // Sizes every column buffer once; dt and ts values are always 19 characters.
+    auto reserve_rows = [&](int64_t rows) {
+        ARROW_CHECK_OK(id_builder.Reserve(rows));
+        ARROW_CHECK_OK(value_builder.Reserve(rows));
+        ARROW_CHECK_OK(dt_builder.Reserve(rows));
+        ARROW_CHECK_OK(ts_builder.Reserve(rows));
+        ARROW_CHECK_OK(dt_builder.ReserveData(rows * 19));
+        ARROW_CHECK_OK(ts_builder.ReserveData(rows * 19));
+    };
+    reserve_rows(inserts.size() + updates.size());
+
+    char ts_buf[32];
+    auto append_change = [&](int64_t pk, const Change& change) {
+        ARROW_CHECK_OK(id_builder.Append(pk));
+        ARROW_CHECK_OK(dt_builder.Append(change.dt));
+        ARROW_CHECK_OK(ts_builder.Append(ts_to_utc2(change.ts, ts_buf)));
+        if (change.val_is_null) {
+            ARROW_CHECK_OK(value_builder.AppendNull());
+        } else {
+            ARROW_CHECK_OK(value_builder.Append(change.val));
+        }
+    };
 
     if (file_exists) {
         std::shared_ptr<arrow::io::ReadableFile> infile;
@@ -152,68 +196,135 @@ void update_parquet_file(const std::string& day,
         auto reader_result = parquet::arrow::OpenFile(infile, pool);
         if (reader_result.ok()) {
             reader = std::move(*reader_result);
-            std::shared_ptr<arrow::Table> table;
-            if (reader->ReadTable(&table).ok() && table->num_rows() > 0) {
-                in_memory_table.reserve(table->num_rows());
+            // Decode the columns in parallel on Arrow's CPU pool.
+            reader->set_use_threads(true);
+            auto file_metadata = reader->parquet_reader()->metadata();
+            int id_column = file_metadata->schema()->ColumnIndex("id");
+
+            // Decode only the four exported columns, looked up by name, so extra columns in older
+            // files (e.g. a pandas index) are never read and the positional casts below stay valid.
+            std::vector<int> column_indices;
+            for (const char* name : {"id", "date_time", "value", "ts"}) {
+                int idx = file_metadata->schema()->ColumnIndex(name);
+                if (idx < 0) {
+                    std::string error_msg = "Missing column '" + std::string(name) + "' in " + file_path;
+                    std::cerr << error_msg << "\n";
+                    throw std::runtime_error(error_msg);
+                }
+                column_indices.push_back(idx);
+            }
+            int64_t existing_rows = file_metadata->num_rows();
+            reserve_rows(existing_rows + inserts.size());
+
+            // Sorted once so each row group's id range can be tested with a binary search.
+            std::vector<int64_t> changed_pks;
+            changed_pks.reserve(deletes.size() + inserts.size() + updates.size());
+            changed_pks.insert(changed_pks.end(), deletes.begin(), deletes.end());
+            for (const auto& pair : inserts) changed_pks.push_back(pair.first);
+            for (const auto& pair : updates) changed_pks.push_back(pair.first);
+            std::sort(changed_pks.begin(), changed_pks.end());
+
+            for (int rg = 0; rg < reader->num_row_groups(); ++rg) {
+                std::shared_ptr<arrow::Table> table;
+                auto read_status = reader->ReadRowGroup(rg, column_indices, &table);
+                if (!read_status.ok()) {
+                    std::string error_msg = "Failed to read row group " + std::to_string(rg) + " of " + file_path + ": " + read_status.message();
+                    std::cerr << error_msg << "\n";
+                    throw std::runtime_error(error_msg);
+                }
+
+                // Row groups whose id statistics hold no changed pk are copied across in bulk.
+                bool may_hold_changes = true;
+                if (id_column >= 0) {
+                    auto stats = file_metadata->RowGroup(rg)->ColumnChunk(id_column)->statistics();
+                    if (stats && stats->HasMinMax()) {
+                        auto id_stats = std::static_pointer_cast<parquet::Int64Statistics>(stats);
+                        auto it = std::lower_bound(changed_pks.begin(), changed_pks.end(), id_stats->min());
+                        may_hold_changes = it != changed_pks.end() && *it <= id_stats->max();
+                    }
+                }
+
                 for (int c = 0; c < table->column(0)->num_chunks(); ++c) {
                     auto id_array = std::static_pointer_cast<arrow::Int64Array>(table->column(0)->chunk(c));
                     auto dt_array = std::static_pointer_cast<arrow::StringArray>(table->column(1)->chunk(c));
                     auto value_array = std::static_pointer_cast<arrow::DoubleArray>(table->column(2)->chunk(c));
                     auto ts_array = std::static_pointer_cast<arrow::StringArray>(table->column(3)->chunk(c));
 
-                    for (int64_t i = 0; i < id_array->length(); ++i) {
-                        in_memory_table[id_array->Value(i)] = {
-                            dt_array->GetString(i),
-                            value_array->IsNull(i) ? std::nullopt : std::optional<double>(value_array->Value(i)),
-                            ts_array->GetString(i)
-                        };
+                    if (!may_hold_changes) {
+                        previous_row_count += id_array->length();
+                        ARROW_CHECK_OK(id_builder.AppendArraySlice(arrow::ArraySpan(*id_array->data()), 0, id_array->length()));
+                        ARROW_CHECK_OK(dt_builder.AppendArraySlice(arrow::ArraySpan(*dt_array->data()), 0, dt_array->length()));
+                        ARROW_CHECK_OK(value_builder.AppendArraySlice(arrow::ArraySpan(*value_array->data()), 0, value_array->length()));
+                        ARROW_CHECK_OK(ts_builder.AppendArraySlice(arrow::ArraySpan(*ts_array->data()), 0, ts_array->length()));
+                        continue;
                     }
-                }
-            }
-        }
 
-        previous_row_count = in_memory_table.size();
-    }
+                    auto copy_existing = [&](int64_t i) {
+                        ARROW_CHECK_OK(id_builder.Append(id_array->Value(i)));
+                        // Missing timestamps are stored as nulls, so carry the validity bit across.
+                        if (dt_array->IsNull(i)) {
+                            ARROW_CHECK_OK(dt_builder.AppendNull());
+                        } else {
+                            ARROW_CHECK_OK(dt_builder.Append(dt_array->GetView(i)));
+                        }
+                        if (ts_array->IsNull(i)) {
+                            ARROW_CHECK_OK(ts_builder.AppendNull());
+                        } else {
+                            ARROW_CHECK_OK(ts_builder.Append(ts_array->GetView(i)));
+                        }
+                        if (value_array->IsNull(i)) {
+                            ARROW_CHECK_OK(value_builder.AppendNull());
+                        } else {
+                            ARROW_CHECK_OK(value_builder.Append(value_array->Value(i)));
+                        }
+                    };
 
-    size_t applied_deletes = 0;
-    size_t applied_updates = 0;
+                    // Anti-join the existing rows against the (small) change sets, copying untouched
+                    // rows straight across instead of rebuilding the whole day in a map. Most rows are
+                    // untouched, so membership is first tested against the contiguous sorted pk array
+                    // and only hits pay for the hash lookups below.
+                    for (int64_t i = 0; i < id_array->length(); ++i) {
+                        int64_t pk = id_array->Value(i);
+                        previous_row_count++;
 
-    // MODIFICATION: New, ordered logic for applying changes.
+                        if (!std::binary_search(changed_pks.begin(), changed_pks.end(), pk)) {
+                            copy_existing(i);
+                            continue;
+                        }
 
-    // 1. Apply Deletes first.
-    for (const auto& pk_to_delete : deletes) {
-        // erase returns 1 if an element was erased, 0 otherwise.
-        applied_deletes += in_memory_table.erase(pk_to_delete);
-    }
+                        // 1. Deletes drop the existing row.
+                        if (deletes.count(pk) > 0) {
+                            applied_deletes++;
+                            continue;
+                        }
+
+                        // 2. Inserts win over the existing row and are appended below.
+                        if (inserts.count(pk) > 0) {
+                            applied_updates += updates.count(pk);
+                            continue;
+                        }
 
-    // 2. Apply Updates (but only if the key already exists).
-    for (const auto& pair : updates) {
-        const int64_t& pk = pair.first;
-        const Change& change = pair.second;
-        // This is the crucial check for the new logic.
-        if (in_memory_table.count(pk) > 0) {
-            in_memory_table[pk] = {
-                std::string(change.dt),
-                change.val_is_null ? std::nullopt : std::optional<double>(change.val),
-                ts_to_utc2(change.ts)
-            };
-
-            applied_updates++;
+                        // 3. Updates only apply to rows that already exist.
+                        auto update_it = updates.find(pk);
+                        if (update_it != updates.end()) {
+                            append_change(pk, update_it->second);
+                            applied_updates++;
+                            continue;
+                        }
+
+                        copy_existing(i);
+                    }
+                }
+            }
         }
     }
-    
-    // 3. Apply Inserts last (these are effectively upserts, which is correct for new rows).
+
+    // 4. Apply Inserts last (these are effectively upserts, which is correct for new rows).
     for (const auto& pair : inserts) {
-        const int64_t& pk = pair.first;
-        const Change& change = pair.second;
-        in_memory_table[pk] = {
-            std::string(change.dt),
-            change.val_is_null ? std::nullopt : std::optional<double>(change.val),
-            ts_to_utc2(change.ts)
-        };
+        append_change(pair.first, pair.second);
     }
     
-    size_t current_row_count = in_memory_table.size();
+    size_t current_row_count = static_cast<size_t>(id_builder.length());
     long long net_change = static_cast<long long>(current_row_count) - static_cast<long long>(previous_row_count);
     
     std::stringstream log_msg;
@@ -227,6 +338,7 @@ void update_parquet_file(const std::string& day,
         if (file_exists) {
             try {
                 std::filesystem::remove(file_path);
+                std::lock_guard<std::mutex> lock(log_mutex);
                 std::cout << "Deleted " << log_msg.str() << std::endl;
             } catch (const std::filesystem::filesystem_error& e) {
                 std::cerr << "Failed to delete " << file_path << ": " << e.what() << "\n";
@@ -237,21 +349,6 @@ void update_parquet_file(const std::string& day,
         return;
     }
 
-    arrow::Int64Builder id_builder;
-    arrow::StringBuilder dt_builder, ts_builder;
-    arrow::DoubleBuilder value_builder;
-
-    for (const auto& pair : in_memory_table) {
-        ARROW_CHECK_OK(id_builder.Append(pair.first));
-        ARROW_CHECK_OK(dt_builder.Append(pair.second.dt));
-        ARROW_CHECK_OK(ts_builder.Append(pair.second.ts));
-        if (pair.second.value.has_value()) {
-            ARROW_CHECK_OK(value_builder.Append(*pair.second.value));
-        } else {
-            ARROW_CHECK_OK(value_builder.AppendNull());
-        }
-    }
-
     std::shared_ptr<arrow::Array> new_id_array, new_dt_array, new_value_array, new_ts_array;
     ARROW_CHECK_OK(id_builder.Finish(&new_id_array));
     ARROW_CHECK_OK(dt_builder.Finish(&new_dt_array));
@@ -260,24 +357,46 @@ void update_parquet_file(const std::string& day,
 
     auto new_table = arrow::Table::Make(schema, {new_id_array, new_dt_array, new_value_array, new_ts_array});
 
+    // Write next to the target and rename over it, so a crash mid-write never leaves a truncated day file.
+    // The pid suffix keeps this temp file apart from db_extractor or another run writing the same day.
+    std::string tmp_path = file_path + ".tmp." + std::to_string(getpid());
     std::shared_ptr<arrow::io::FileOutputStream> outfile;
-    auto open_outfile = arrow::io::FileOutputStream::Open(file_path);
+    auto open_outfile = arrow::io::FileOutputStream::Open(tmp_path);
     if (!open_outfile.ok()) {
-        std::string error_msg = "Failed to open " + file_path + " for writing: " + open_outfile.status().message();
+        std::string error_msg = "Failed to open " + tmp_path + " for writing: " + open_outfile.status().message();
         std::cerr << error_msg << "\n";
         throw std::runtime_error(error_msg);
     }
     outfile = *open_outfile;
 
     parquet::WriterProperties::Builder writer_props_builder;
-    writer_props_builder.compression(parquet::Compression::SNAPPY);
-    auto write_status = parquet::arrow::WriteTable(*new_table, pool, outfile, 1024 * 1024, writer_props_builder.build());
+    writer_props_builder.compression(parquet::Compression::ZSTD);
+    writer_props_builder.compression_level(3);
+    writer_props_builder.enable_dictionary();
+    writer_props_builder.data_pagesize(1 << 20);
+    // Encode and compress the columns of each row group on Arrow's CPU pool rather than one after another.
+    parquet::ArrowWriterProperties::Builder arrow_props_builder;
+    arrow_props_builder.set_use_threads(true);
+    auto write_status = parquet::arrow::WriteTable(*new_table, pool, outfile, 50000, writer_props_builder.build(), arrow_props_builder.build());
     if (!write_status.ok()) {
-        std::string error_msg = "Failed to write table to " + file_path + ": " + write_status.message();
+        std::string error_msg = "Failed to write table to " + tmp_path + ": " + write_status.message();
+        std::cerr << error_msg << "\n";
+        throw std::runtime_error(error_msg);
+    }
+    auto close_status = outfile->Close();
+    if (!close_status.ok()) {
+        std::string error_msg = "Failed to close " + tmp_path + ": " + close_status.message();
         std::cerr << error_msg << "\n";
         throw std::runtime_error(error_msg);
     }
+    try {
+        std::filesystem::rename(tmp_path, file_path);
+    } catch (const std::filesystem::filesystem_error& e) {
+        std::cerr << "Failed to rename " << tmp_path << " to " << file_path << ": " << e.what() << "\n";
+        throw;
+    }
 
+    std::lock_guard<std::mutex> lock(log_mutex);
     if (file_exists) {
         std::cout << "Modified " << log_msg.str() << std::endl;
     } else {
@@ -285,13 +404,49 @@ void update_parquet_file(const std::string& day,
     }
 }
 
+// Reads stdin in large blocks and hands out each line as a view into the block buffer,
+// so input is consumed with one read() per megabyte and no per-line copy.
+struct LineReader {
+    std::vector<char> buf = std::vector<char>(1 << 20);
+    size_t begin = 0;
+    size_t end = 0;
+    bool eof = false;
+
+    // The returned view stays valid until the next call.
+    bool next(std::string_view& out) {
+        while (true) {
+            const char* start = buf.data() + begin;
+            const char* nl = static_cast<const char*>(std::memchr(start, '\n', end - begin));
+            if (nl) {
+                out = std::string_view(start, nl - start);
+                begin += (nl - start) + 1;
+                return true;
+            }
+            if (eof) {
+                if (begin == end) return false;
+                out = std::string_view(start, end - begin);
+                begin = end;
+                return true;
+            }
+            // Keep the partial line at the front of the buffer, growing it only for lines longer than the buffer.
+            std::memmove(buf.data(), start, end - begin);
+            end -= begin;
+            begin = 0;
+            if (end == buf.size()) buf.resize(buf.size() * 2);
+            size_t n = std::fread(buf.data() + end, 1, buf.size() - end, stdin);
+            if (n == 0) {
+                if (std::ferror(stdin)) throw std::runtime_error("Failed to read binlog events from stdin.");
+                eof = true;
+            }
+            end += n;
+        }
+    }
+};
+
 int main() {
     try {
         auto start_time = std::chrono::high_resolution_clock::now();
 
-        std::ios::sync_with_stdio(false);
-        std::cin.tie(nullptr);
-
         // MODIFICATION: Replaced 'changes_by_day' with separate insert/update maps.
         std::unordered_map<std::string, std::unordered_map<int64_t, Change>> inserts_by_day;
         std::unordered_map<std::string, std::unordered_map<int64_t, Change>> updates_by_day;
@@ -304,67 +459,82 @@ int main() {
         int64_t pk = 0;
         uint64_t ts = 0;
         std::string dt, val_raw;
-        std::string line;
-        line.reserve(256);
+        LineReader reader;
+        std::string_view line;
 
-        while (std::getline(std::cin, line)) {
-            std::string tline = trim(line);
+        while (reader.next(line)) {
+            // Lines, column names and values are handled as views into the read buffer; only dt and
+            // val_raw are copied, into buffers whose capacity is reused across events.
+            std::string_view tline = trim(line);
             if (tline.empty()) continue;
 
-            if (tline == "INSERT INTO `enexory`.`api_data_timeseries`") {
-                if (current_type != 0 && pk != 0) {
-                    // MODIFICATION: Pass new maps to process_block.
-                    process_block(current_type, pk, dt, val_raw, ts, inserts_by_day, updates_by_day, deleted_by_day);
-                    pk = 0; ts = 0; dt.clear(); val_raw.clear();
+            // Column lines are the bulk of the input, so they are recognised by their first byte
+            // before any of the statement headers are compared.
+            if (tline[0] == '@') {
+                if (current_type == 0 || tline.size() <= 3) continue;
+                size_t eq_pos = tline.find('=');
+                if (eq_pos == std::string::npos) continue;
+                int col = 0;
+                for (size_t i = 1; i < eq_pos; ++i) {
+                    char c = tline[i];
+                    if (c < '0' || c > '9') { col = 0; break; }
+                    col = col * 10 + (c - '0');
                 }
-                current_type = 'I';
-                continue;
-            } else if (tline == "UPDATE `enexory`.`api_data_timeseries`") {
-                if (current_type != 0 && pk != 0) {
-                    process_block(current_type, pk, dt, val_raw, ts, inserts_by_day, updates_by_day, deleted_by_day);
-                    pk = 0; ts = 0; dt.clear(); val_raw.clear();
+                std::string_view val = trim(tline.substr(eq_pos + 1));
+
+                switch (col) {
+                    case 1:
+                        pk = 0;
+                        for (char c : val) {
+                            if (c < '0' || c > '9') { pk = 0; break; }
+                            pk = pk * 10 + (c - '0');
+                        }
+                        break;
+                    case 3:
+                        dt.assign((val.size() > 2 && val.front() == '\'' && val.back() == '\'') ?
+                            val.substr(1, val.size() - 2) : val);
+                        break;
+                    case 4:
+                        if (current_type != 'D') val_raw.assign(val);
+                        break;
+                    case 6:
+                        if (current_type != 'D') {
+                            ts = 0;
+                            for (char c : val) {
+                                if (c < '0' || c > '9') { ts = 0; break; }
+                                ts = ts * 10 + (c - '0');
+                            }
+                        }
+                        break;
+                    default:
+                        break;
                 }
-                current_type = 'U';
                 continue;
-            } else if (tline == "DELETE FROM `enexory`.`api_data_timeseries`") {
+            }
+
+            // Statement headers: one dispatch on the leading keyword's first byte, then a single full compare.
+            char event_type = 0;
+            switch (tline[0]) {
+                case 'I':
+                    if (tline == "INSERT INTO `enexory`.`api_data_timeseries`") event_type = 'I';
+                    break;
+                case 'U':
+                    if (tline == "UPDATE `enexory`.`api_data_timeseries`") event_type = 'U';
+                    break;
+                case 'D':
+                    if (tline == "DELETE FROM `enexory`.`api_data_timeseries`") event_type = 'D';
+                    break;
+                default:
+                    // WHERE / SET and anything else carry no state.
+                    break;
+            }
+            if (event_type != 0) {
                 if (current_type != 0 && pk != 0) {
+                    // MODIFICATION: Pass new maps to process_block.
                     process_block(current_type, pk, dt, val_raw, ts, inserts_by_day, updates_by_day, deleted_by_day);
                     pk = 0; ts = 0; dt.clear(); val_raw.clear();
                 }
-                current_type = 'D';
-                continue;
-            } else if (tline == "WHERE") {
-                continue;
-            } else if (tline == "SET") {
-                continue;
-            }
-
-            if (current_type != 0 && tline.size() > 3 && tline[0] == '@') {
-                size_t eq_pos = tline.find('=');
-                if (eq_pos == std::string::npos) continue;
-                std::string col = tline.substr(0, eq_pos);
-                std::string val = trim(tline.substr(eq_pos + 1));
-
-                if (col == "@1") {
-                    pk = 0;
-                    for (char c : val) {
-                        if (c < '0' || c > '9') { pk = 0; break; }
-                        pk = pk * 10 + (c - '0');
-                    }
-                } else if (col == "@3") {
-                    dt = (val.size() > 2 && val.front() == '\'' && val.back() == '\'') ? 
-                        val.substr(1, val.size() - 2) : val;
-                } else if (current_type != 'D') {
-                    if (col == "@4") {
-                        val_raw = (val == "NULL") ? "NULL" : val;
-                    } else if (col == "@6") {
-                        ts = 0;
-                        for (char c : val) {
-                            if (c < '0' || c > '9') { ts = 0; break; }
-                            ts = ts * 10 + (c - '0');
-                        }
-                    }
-                }
+                current_type = event_type;
             }
         }
 
@@ -382,27 +552,55 @@ int main() {
         for (const auto& pair : deleted_by_day) { days_to_process_set.insert(pair.first); }
         std::vector<std::string> days_to_process(days_to_process_set.begin(), days_to_process_set.end());
 
-        for (const std::string& day : days_to_process) {
-            // MODIFICATION: Find and pass the correct maps for the current day to the update function.
-            const static std::unordered_map<int64_t, Change> empty_changes;
-            const static std::unordered_set<int64_t> empty_deletes;
-
-            auto inserts_it = inserts_by_day.find(day);
-            const auto& inserts = (inserts_it != inserts_by_day.end()) 
-                                    ? inserts_it->second 
-                                    : empty_changes;
-            
-            auto updates_it = updates_by_day.find(day);
-            const auto& updates = (updates_it != updates_by_day.end()) 
-                                    ? updates_it->second 
-                                    : empty_changes;
-
-            auto deleted_it = deleted_by_day.find(day);
-            const auto& deletes = (deleted_it != deleted_by_day.end()) 
-                                    ? deleted_it->second 
-                                    : empty_deletes;
-
-            update_parquet_file(day, inserts, updates, deletes, base_folder);
+        // Each day is its own file, so decoding, compression and writes for different days overlap
+        // on a few worker threads. Bounded because every worker holds a whole day in memory.
+        const static std::unordered_map<int64_t, Change> empty_changes;
+        const static std::unordered_set<int64_t> empty_deletes;
+        std::atomic<size_t> next_day{0};
+        std::exception_ptr first_error;
+        std::mutex error_mutex;
+
+        auto write_days = [&]() {
+            for (size_t idx = next_day++; idx < days_to_process.size(); idx = next_day++) {
+                const std::string& day = days_to_process[idx];
+
+                // MODIFICATION: Find and pass the correct maps for the current day to the update function.
+                auto inserts_it = inserts_by_day.find(day);
+                const auto& inserts = (inserts_it != inserts_by_day.end()) 
+                                        ? inserts_it->second 
+                                        : empty_changes;
+                
+                auto updates_it = updates_by_day.find(day);
+                const auto& updates = (updates_it != updates_by_day.end()) 
+                                        ? updates_it->second 
+                                        : empty_changes;
+
+                auto deleted_it = deleted_by_day.find(day);
+                const auto& deletes = (deleted_it != deleted_by_day.end()) 
+                                        ? deleted_it->second 
+                                        : empty_deletes;
+
+                try {
+                    update_parquet_file(day, inserts, updates, deletes, base_folder);
+                } catch (...) {
+                    std::lock_guard<std::mutex> lock(error_mutex);
+                    if (!first_error) first_error = std::current_exception();
+                    next_day = days_to_process.size();
+                }
+            }
+        };
+
+        size_t worker_count = std::min<size_t>({days_to_process.size(), std::max(1u, std::thread::hardware_concurrency()), 4});
+        std::vector<std::thread> workers;
+        for (size_t w = 1; w < worker_count; ++w) {
+            workers.emplace_back(write_days);
+        }
+        write_days();
+        for (auto& worker : workers) {
+            worker.join();
+        }
+        if (first_error) {
+            std::rethrow_exception(first_error);
         }
 
         auto end_time = std::chrono::high_resolution_clock::now();
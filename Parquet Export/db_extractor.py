@@ -1,25 +1,42 @@
 import os
 import mysql.connector
+from mysql.connector.pooling import MySQLConnectionPool
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import fastparquet
 import time
-import glob
 from datetime import timedelta, datetime
-import re
 import numpy as np
 
 ENV_VAR_MYSQL_CONN_STRING = "MYSQL_CONN_STRING"
 MIN_DATE = "2010-01-02 00:00:00"
 CHUNK_SIZE = 1000000
-DT_FORMAT_REGEX = r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$"
 BASE_FOLDER = "/root/data"
+DT_DIGIT_POSITIONS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]
+DT_SEPARATORS = {4: "-", 7: "-", 10: " ", 13: ":", 16: ":"}
+INVALID_DT_SENTINEL = "0001-01-01 00:00:00"
+DAY_WORKERS = 8
+DAYS_PER_QUERY = 7
+PARQUET_COLUMNS = ["id", "date_time", "value", "ts"]
+PARQUET_COMPRESSION = {"_default": {"type": "ZSTD", "args": {"level": 3}}}
+ROW_GROUP_SIZE = 50000
+# Pinned so an all-null chunk is still written as a string column.
+PARQUET_OBJECT_ENCODING = {"date_time": "utf8", "ts": "utf8"}
+# Applied while each chunk is built, so a chunk of all-NULL values cannot change a column type between appends.
+SQL_DTYPES = {"id": "int64", "value": "float64"}
 
-def get_connection():
+def get_connection_args():
     conn_str = os.getenv(ENV_VAR_MYSQL_CONN_STRING)
     if conn_str:
-        return mysql.connector.connect(**parse_conn_string(conn_str))
+        return parse_conn_string(conn_str)
     raise ValueError("Connection string missing in env variable.")
 
+def get_connection():
+    return mysql.connector.connect(**get_connection_args())
+
+def get_connection_pool(pool_size):
+    return MySQLConnectionPool(pool_name="db_extractor", pool_size=pool_size, **get_connection_args())
+
 def parse_conn_string(conn_str):
     parts = [p.strip() for p in conn_str.split(";") if p.strip()]
     kv = dict(p.split("=", 1) for p in parts)
@@ -48,26 +65,61 @@ def get_max_db_date(conn, table, dt_col):
         cursor.close()
         raise RuntimeError("Please make sure a max date is available from the database.")
 
+def list_parquet_files(folder):
+    """Returns a (name, path) pair for every *.parquet file in folder, from a single directory read."""
+    with os.scandir(folder) as it:
+        return [(entry.name, entry.path) for entry in it if entry.name.endswith(".parquet") and entry.is_file()]
+
+def temp_path(file_path):
+    """
+    Returns the temp file a writer fills before renaming it over `file_path`.
+    The pid suffix keeps this process apart from consolidate or another extractor
+    writing the same day at the same time.
+    """
+    return f"{file_path}.tmp.{os.getpid()}"
+
+def latest_valid_dt(pf, day, dt_column):
+    """
+    Returns the newest value of dt_column in the ParquetFile for `day`.
+    Uses the per-row-group max statistics from the footer, which already ignore nulls.
+    Row groups without a max (no string statistics, or only nulls) fall back to the
+    start of the day from the file name, since the incremental run refetches that
+    whole day anyway. The result is never earlier than that start of day.
+    """
+    day_start = f"{day} 00:00:00"
+    maxes = pf.statistics.get("max", {}).get(dt_column, [])
+    if maxes and all(m is not None for m in maxes):
+        return max(max(maxes), day_start)
+    return day_start
+
 def find_latest_dt(base_folder, dt_column):
     """
     Finds the resume point for incremental runs.
+    Files are named YYYY-MM-DD.parquet, so the newest day is found by name and
+    only that file's footer is opened. The sentinel day's file holds only rows
+    without a valid date_time, so it never gives a resume point.
     """
-    files = sorted(glob.glob(os.path.join(base_folder, "*.parquet")), reverse=True)
-    invalid_sentinel_value = "0001-01-01 00:00:00"
+    files = sorted(list_parquet_files(base_folder), reverse=True)
+    sentinel_day = INVALID_DT_SENTINEL[:10]
 
     print("Scanning newest files to find resume point...")
-    for f in files:
+    for name, f in files:
+        day = name[:-len(".parquet")]
+        try:
+            datetime.strptime(day, "%Y-%m-%d")
+        except ValueError:
+            print(f"Skipping file with invalid date format: {f}")
+            continue
+        if day == sentinel_day:
+            continue
+
         try:
             pf = fastparquet.ParquetFile(f)
-            if pf.count == 0: continue
-            df = pf.to_pandas(columns=[dt_column])
-            if df.empty: continue
-
-            valid_strings = df[dt_column][df[dt_column] != invalid_sentinel_value]
-            if not valid_strings.empty:
-                latest_dt_str = valid_strings.max()
-                print(f"Found latest timestamp '{latest_dt_str}' in file: {os.path.basename(f)}")
-                return latest_dt_str
+            if pf.count() == 0: continue
+
+            latest_dt_str = latest_valid_dt(pf, day, dt_column)
+            print(f"Found latest timestamp '{latest_dt_str}' in file: {name}")
+            return latest_dt_str
         except Exception as e:
             print(f"Skipping {f} due to error: {e}")
             continue
@@ -75,10 +127,87 @@ def find_latest_dt(base_folder, dt_column):
     print(f"No recent timestamps found. Starting from the safe boundary: {MIN_DATE}")
     return MIN_DATE
 
+def latest_day_is_current(conn, day, table, dt_col, base_folder):
+    """
+    Returns True when the day's parquet file already matches the database, judged by
+    the file's max(ts) and footer row count against MAX(ts) and COUNT(*) for that day.
+    A missing file or ts values means the day has to be refetched.
+    """
+    file_path = os.path.join(base_folder, f"{day.strftime('%Y-%m-%d')}.parquet")
+    try:
+        pf = fastparquet.ParquetFile(file_path)
+    except Exception:
+        return False
+    maxes = pf.statistics.get("max", {}).get("ts", [])
+    if maxes and all(m is not None for m in maxes):
+        file_max_ts = max(maxes)
+    else:
+        # No string statistics (e.g. object columns holding nulls), so decode just the ts column.
+        ts_values = pf.to_pandas(columns=["ts"])["ts"].dropna()
+        if ts_values.empty:
+            return False
+        file_max_ts = ts_values.max()
+
+    start_of_day = day.strftime('%Y-%m-%d 00:00:00')
+    end_of_day = (day + timedelta(days=1)).strftime('%Y-%m-%d 00:00:00')
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            f"SELECT MAX(`ts`), COUNT(*) FROM `{table}` WHERE `{dt_col}` >= %s AND `{dt_col}` < %s",
+            (start_of_day, end_of_day)
+        )
+        db_max_ts, db_count = cursor.fetchone()
+    finally:
+        cursor.close()
+
+    if db_max_ts is None:
+        return False
+    return db_count == pf.count() and db_max_ts.strftime('%Y-%m-%d %H:%M:%S') == file_max_ts
+
+def dt_format_mask(series):
+    """
+    Returns a boolean array that is True where a value has the 'YYYY-MM-DD HH:MM:SS' layout,
+    with digits at DT_DIGIT_POSITIONS and DT_SEPARATORS between them.
+    The fixed-width layout is checked on the raw code points of the whole column at once.
+    """
+    # One spare column so values longer than 19 characters can be rejected.
+    codes = series.fillna("").to_numpy(dtype="U20").view(np.uint32).reshape(-1, 20)
+    digits = codes[:, DT_DIGIT_POSITIONS]
+    mask = ((digits >= ord("0")) & (digits <= ord("9"))).all(axis=1)
+    for pos, sep in DT_SEPARATORS.items():
+        mask &= codes[:, pos] == ord(sep)
+    mask &= codes[:, 19] == 0
+    return mask
+
+def to_datetime64s(series):
+    """
+    Converts a datetime column to a datetime64[s] array.
+    Works at second resolution so historical dates before 1677 survive, and
+    NULL or unparseable values become NaT.
+    """
+    try:
+        values = series.astype("datetime64[s]")
+    except (ValueError, TypeError):
+        values = pd.to_datetime(series, errors="coerce").astype("datetime64[s]")
+    return values.to_numpy()
+
+def format_dt_series(series, raw=None):
+    """
+    Formats a datetime column as 'YYYY-MM-DD HH:MM:SS' in one vectorized pass.
+    NULL or unparseable values become None, which is written as a parquet null.
+    Pass `raw` when the to_datetime64s() array of the column is already at hand.
+    """
+    if raw is None:
+        raw = to_datetime64s(series)
+    # ISO strings are zero-padded to 4-digit years, unlike strftime("%Y") for years < 1000.
+    iso = np.datetime_as_string(raw, unit="s").astype("U19")
+    iso.view(np.uint32).reshape(-1, 19)[:, 10] = ord(" ")
+    out = iso.astype(object)
+    out[np.isnat(raw)] = None
+    return pd.Series(out, index=series.index, dtype=object)
+
 def validate_and_clean_df(df, file_path):
     """Validates DataFrame in memory, raising an error if any row is invalid."""
-    print(f"Validating {file_path} with {len(df)} rows")
-    
     # Expected dtypes
     expected_dtypes = {
         "id": np.int64,
@@ -92,72 +221,48 @@ def validate_and_clean_df(df, file_path):
         if col not in df:
             raise ValueError(f"Missing column '{col}' in {file_path}")
     
-    # Convert dtypes to ensure consistency
-    cleaned_df = pd.DataFrame({
-        "id": pd.Series(dtype=np.int64),
-        "date_time": pd.Series(dtype="string"),
-        "value": pd.Series(dtype="float64"),
-        "ts": pd.Series(dtype="string")
-    })
-    
-    # Validate each row
-    for idx, row in df.iterrows():
-        cleaned_row = {}
-        
-        # id: Must be int64, non-negative
-        try:
-            id_val = np.int64(row["id"])
-            if id_val < 0:
-                raise ValueError(f"Row {idx} in {file_path}: Negative id value: {row['id']}")
-            cleaned_row["id"] = id_val
-        except (ValueError, TypeError, OverflowError) as e:
-            raise ValueError(f"Row {idx} in {file_path}: Invalid int64 for id: {row['id']} ({str(e)})")
-        
-        # date_time: Must be string, 19 chars, valid format
-        try:
-            dt_str = str(row["date_time"])
-            if len(dt_str) != 19:
-                raise ValueError(f"Row {idx} in {file_path}: date_time length {len(dt_str)} != 19: {dt_str}")
-            if not re.match(DT_FORMAT_REGEX, dt_str):
-                raise ValueError(f"Row {idx} in {file_path}: Invalid date_time format: {dt_str}")
-            cleaned_row["date_time"] = dt_str
-        except Exception as e:
-            raise ValueError(f"Row {idx} in {file_path}: date_time error: {str(e)}")
-        
-        # value: Must be float64 or null
-        try:
-            if pd.isna(row["value"]):
-                cleaned_row["value"] = np.nan
-            else:
-                cleaned_row["value"] = float(row["value"])
-        except (ValueError, TypeError) as e:
-            raise ValueError(f"Row {idx} in {file_path}: Invalid float64 for value: {row['value']} ({str(e)})")
-        
-        # ts: Must be string, 19 chars, valid format
-        try:
-            ts_str = str(row["ts"])
-            if len(ts_str) != 19:
-                raise ValueError(f"Row {idx} in {file_path}: ts length {len(ts_str)} != 19: {ts_str}")
-            if not re.match(DT_FORMAT_REGEX, ts_str):
-                raise ValueError(f"Row {idx} in {file_path}: Invalid ts format: {ts_str}")
-            cleaned_row["ts"] = ts_str
-        except Exception as e:
-            raise ValueError(f"Row {idx} in {file_path}: ts error: {str(e)}")
-        
-        cleaned_df = pd.concat([cleaned_df, pd.DataFrame([cleaned_row])], ignore_index=True)
-    
-    return cleaned_df
+    # id: Must be int64, non-negative
+    ids = pd.to_numeric(df["id"], errors="coerce")
+    bad_id = ids.isna() | (ids < 0)
+    if bad_id.any():
+        pos = np.flatnonzero(bad_id.to_numpy(dtype=bool))[0]
+        raise ValueError(f"Row {df.index[pos]} in {file_path}: Invalid or negative int64 for id: {df['id'].iat[pos]}")
+
+    # value: Must be float64 or null
+    values = pd.to_numeric(df["value"], errors="coerce")
+    bad_value = values.isna() & df["value"].notna()
+    if bad_value.any():
+        pos = np.flatnonzero(bad_value.to_numpy(dtype=bool))[0]
+        raise ValueError(f"Row {df.index[pos]} in {file_path}: Invalid float64 for value: {df['value'].iat[pos]}")
+
+    # date_time / ts: Must be null or a 19 char string in a valid format
+    dt_strings = {}
+    for col in ["date_time", "ts"]:
+        s = df[col].astype("string")
+        # Older files stored missing timestamps as a fake date; rewrite those as nulls.
+        s = s.mask(s == INVALID_DT_SENTINEL)
+        bad = ~dt_format_mask(s) & s.notna().to_numpy()
+        if bad.any():
+            pos = np.flatnonzero(bad)[0]
+            raise ValueError(f"Row {df.index[pos]} in {file_path}: Invalid {col} format: {df[col].iat[pos]}")
+        dt_strings[col] = s
+
+    return pd.DataFrame({
+        "id": ids.astype(np.int64).to_numpy(),
+        "date_time": dt_strings["date_time"].to_numpy(),
+        "value": values.astype("float64").to_numpy(),
+        "ts": dt_strings["ts"].to_numpy()
+    }).astype(expected_dtypes)
 
 def repair_historical_data():
     """Repairs Parquet files older than MIN_DATE in memory, raising errors for invalid data."""
     min_date = datetime.strptime(MIN_DATE, "%Y-%m-%d %H:%M:%S")
     
     # Find Parquet files
-    files = glob.glob(os.path.join(BASE_FOLDER, "*.parquet"))
     historical_files = []
-    for f in files:
+    for name, f in list_parquet_files(BASE_FOLDER):
         try:
-            file_date_str = os.path.basename(f).replace(".parquet", "")
+            file_date_str = name[:-len(".parquet")]
             file_date = datetime.strptime(file_date_str, "%Y-%m-%d")
             if file_date < min_date:
                 historical_files.append(f)
@@ -170,96 +275,141 @@ def repair_historical_data():
     
     print(f"Found {len(historical_files)} historical Parquet files to repair")
     
-    for file_path in historical_files:
+    # Each file is repaired independently, and compression/file I/O release the GIL.
+    # Workers return their status instead of printing it, so the log stays in file order.
+    with ThreadPoolExecutor(max_workers=DAY_WORKERS) as executor:
+        futures = [executor.submit(_repair_historical_file, file_path) for file_path in historical_files]
         try:
-            # Read Parquet
-            df = pd.read_parquet(file_path)
-            if df.empty:
-                print(f"Skipping empty file: {file_path}")
-                continue
-            
-            # Validate and clean in memory
-            cleaned_df = validate_and_clean_df(df, file_path)
-            
-            # Overwrite Parquet file
-            fastparquet.write(file_path, cleaned_df, compression="snappy", append=False)
-            print(f"Overwrote {file_path} with {len(cleaned_df)} valid rows")
-            
-        except ValueError as e:
-            print(f"Validation error in {file_path}: {str(e)}")
-            raise  # Stop processing on first invalid file
-        except Exception as e:
-            print(f"Error processing {file_path}: {str(e)}")
+            for file_path, future in zip(historical_files, futures):
+                try:
+                    print(future.result())
+                except ValueError as e:
+                    print(f"Validation error in {file_path}: {str(e)}")
+                    raise
+                except Exception as e:
+                    print(f"Error processing {file_path}: {str(e)}")
+                    raise
+        except Exception:
+            # Stop processing on first invalid file
+            for future in futures:
+                future.cancel()
             raise
 
+def _repair_historical_file(file_path):
+    """
+    Validates one historical Parquet file and rewrites it in place.
+    Returns the status lines for the caller to print; errors are raised.
+    """
+    # Read Parquet, skipping empty files from the footer and decoding only the exported columns
+    pf = fastparquet.ParquetFile(file_path)
+    if pf.count() == 0:
+        return f"Skipping empty file: {file_path}"
+    df = pf.to_pandas(columns=[c for c in PARQUET_COLUMNS if c in pf.columns])
+
+    # Validate and clean in memory
+    cleaned_df = validate_and_clean_df(df, file_path)
+
+    # Overwrite Parquet file through a temp file, so a crash mid-write keeps the old one
+    tmp_path = temp_path(file_path)
+    fastparquet.write(tmp_path, cleaned_df, compression=PARQUET_COMPRESSION, row_group_offsets=ROW_GROUP_SIZE, object_encoding=PARQUET_OBJECT_ENCODING, write_index=False, append=False, stats=True)
+    os.replace(tmp_path, file_path)
+    return f"Validated {file_path} with {len(df)} rows\nOverwrote {file_path} with {len(cleaned_df)} valid rows"
+
 def run_historical_extraction(conn, query, params, chunk_size, base_folder):
     """A dedicated loop for the one-time historical backfill with safe date handling."""
     # This function is unchanged.
-    iterator = pd.read_sql(query, conn, params=params, chunksize=chunk_size)
+    iterator = pd.read_sql(query, conn, params=params, chunksize=chunk_size, dtype=SQL_DTYPES)
     total_extracted = 0
     start_time = time.time()
     print("Starting historical data extraction...")
 
+    # Days are appended to temp files across chunks and only renamed into place once the whole backfill succeeded.
+    rows_written = {}
     for df_chunk in iterator:
         if df_chunk.empty: continue
-        # Use a special formatter for potentially very old historical dates
-        custom_formatter = lambda x: f"{x.year:04d}-{x.month:02d}-{x.day:02d} {x.hour:02d}:{x.minute:02d}:{x.second:02d}" if pd.notna(x) and hasattr(x, 'strftime') else "0001-01-01 00:00:00"
-        for col in ["date_time", "ts"]:
-            df_chunk[col] = df_chunk[col].apply(custom_formatter)
-        df_chunk["day"] = df_chunk[dt_col].str[:10]
-        for day, group in df_chunk.groupby("day"):
-            file_path = os.path.join(base_folder, f"{day}.parquet")
-            fastparquet.write(file_path, group.drop(columns=["day"]), compression="snappy", append=os.path.exists(file_path))
+        # Potentially very old historical dates, so convert at second resolution
+        raw_dt = to_datetime64s(df_chunk[dt_col])
+        df_chunk[dt_col] = format_dt_series(df_chunk[dt_col], raw_dt)
+        df_chunk["ts"] = format_dt_series(df_chunk["ts"])
+        # Bucket rows by integer day number in the order they arrive, instead of slicing and sorting strings.
+        day_numbers = raw_dt.astype("datetime64[D]").astype(np.int64)
+        for day_number, group in df_chunk.groupby(day_numbers, sort=False):
+            day_value = np.datetime64(int(day_number), "D")
+            # Rows without a usable date_time still need a file; they keep going to the sentinel day.
+            day = INVALID_DT_SENTINEL[:10] if np.isnat(day_value) else str(day_value)
+            tmp_path = temp_path(os.path.join(base_folder, f"{day}.parquet"))
+            fastparquet.write(tmp_path, group, compression=PARQUET_COMPRESSION, row_group_offsets=ROW_GROUP_SIZE, object_encoding=PARQUET_OBJECT_ENCODING, write_index=False, append=day in rows_written, stats=True)
+            rows_written[day] = rows_written.get(day, 0) + len(group)
             total_extracted += len(group)
-            print(f"Wrote {len(group)} historical rows to {file_path}")
+            print(f"Wrote {len(group)} historical rows to {tmp_path}")
+    for day in rows_written:
+        file_path = os.path.join(base_folder, f"{day}.parquet")
+        os.replace(temp_path(file_path), file_path)
     elapsed = time.time() - start_time
     print(f"Historical extraction finished. {total_extracted} rows in {elapsed:.2f}s")
 
-def _process_single_day(conn, day_to_process, table, dt_col, base_folder, chunk_size):
+def _process_day_range(conn, first_day, num_days, table, dt_col, base_folder, chunk_size):
     """
-    Fetches all data for a single day, overwrites the corresponding file, and returns row count.
+    Fetches `num_days` consecutive days starting at `first_day` with a single range query,
+    splits the rows by day client-side, overwrites each day's file, and returns
+    a {YYYY-MM-DD: row count} dict for the days that had data.
     """
-    start_of_day = pd.Timestamp(day_to_process)
-    end_of_day = start_of_day + timedelta(days=1)
+    start_of_range = pd.Timestamp(first_day)
+    end_of_range = start_of_range + timedelta(days=num_days)
     
     query = f"""
         SELECT id, date_time, value, ts FROM `{table}`
-        WHERE `{dt_col}` >= %(start_of_day)s AND `{dt_col}` < %(end_of_day)s
+        WHERE `{dt_col}` >= %(start_of_range)s AND `{dt_col}` < %(end_of_range)s
+        ORDER BY `{dt_col}`
     """
     
-    iterator = pd.read_sql(query, conn, params={"start_of_day": start_of_day, "end_of_day": end_of_day}, chunksize=chunk_size)
-    
-    all_chunks_for_day = []
-    for df_chunk in iterator:
-        if not df_chunk.empty:
-            all_chunks_for_day.append(df_chunk)
+    iterator = pd.read_sql(query, conn, params={"start_of_range": start_of_range, "end_of_range": end_of_range}, chunksize=chunk_size, dtype=SQL_DTYPES)
 
-    if not all_chunks_for_day:
-        return 0
+    # Each chunk is appended to its days' temp files as its own row group, so only one chunk is held in memory.
+    rows_written = {}
+    for df_chunk in iterator:
+        if df_chunk.empty: continue
+        for col in ["date_time", "ts"]:
+            df_chunk[col] = format_dt_series(df_chunk[col])
+        df_chunk["day"] = df_chunk[dt_col].str[:10]
+        for day, group in df_chunk.groupby("day", sort=False):
+            tmp_path = temp_path(os.path.join(base_folder, f"{day}.parquet"))
+            fastparquet.write(tmp_path, group.drop(columns=["day"]), compression=PARQUET_COMPRESSION, row_group_offsets=ROW_GROUP_SIZE, object_encoding=PARQUET_OBJECT_ENCODING, write_index=False, append=day in rows_written, stats=True)
+            rows_written[day] = rows_written.get(day, 0) + len(group)
 
-    full_day_df = pd.concat(all_chunks_for_day, ignore_index=True)
-    
-    for col in ["date_time", "ts"]:
-        dt_series = pd.to_datetime(full_day_df[col], errors="coerce")
-        fmt_series = dt_series.dt.strftime("%Y-%m-%d %H:%M:%S")
-        full_day_df[col] = fmt_series.fillna("0001-01-01 00:00:00")
-        
-    file_path = os.path.join(base_folder, f"{day_to_process.strftime('%Y-%m-%d')}.parquet")
-    fastparquet.write(file_path, full_day_df, compression="snappy", append=False)
-    
-    rows_written = len(full_day_df)
-    print(f"Wrote {rows_written} rows to {file_path} (overwritten).")
+    for day, rows in rows_written.items():
+        file_path = os.path.join(base_folder, f"{day}.parquet")
+        os.replace(temp_path(file_path), file_path)
+        print(f"Wrote {rows} rows to {file_path} (overwritten).")
     return rows_written
 
+def _process_single_day(conn, day_to_process, table, dt_col, base_folder, chunk_size):
+    """
+    Fetches all data for a single day, overwrites the corresponding file, and returns row count.
+    """
+    rows_written = _process_day_range(conn, day_to_process, 1, table, dt_col, base_folder, chunk_size)
+    return rows_written.get(day_to_process.strftime('%Y-%m-%d'), 0)
+
+def _process_days_pooled(pool, days, table, dt_col, base_folder, chunk_size):
+    """Runs _process_day_range for a window of consecutive days on a connection borrowed from the pool."""
+    conn = pool.get_connection()
+    try:
+        return _process_day_range(conn, days[0], len(days), table, dt_col, base_folder, chunk_size)
+    finally:
+        conn.close()
+
 def main():
-    conn = get_connection()
+    # One extra connection for the serial steps below, which hold theirs while the day workers run.
+    pool = get_connection_pool(DAY_WORKERS + 1)
+    conn = pool.get_connection()
     try:
         global table, dt_col
         table = "api_data_timeseries"
         dt_col = "date_time"
 
         os.makedirs(BASE_FOLDER, exist_ok=True)
-        files_exist = bool(glob.glob(os.path.join(BASE_FOLDER, "*.parquet")))
+        with os.scandir(BASE_FOLDER) as it:
+            files_exist = any(entry.name.endswith(".parquet") for entry in it)
         
         if not files_exist:
             print("="*50 + "\nNO PARQUET FILES FOUND. PERFORMING ONE-TIME HISTORICAL BACKFILL.\n" + "="*50)
@@ -286,8 +436,11 @@ def main():
             current_date_for_loop = latest_timestamp.date()
         else:
             date_to_refetch = latest_timestamp.date()
-            print(f"\n--- REFETCHING LATEST DAY: {date_to_refetch.strftime('%Y-%m-%d')} ---")
-            _process_single_day(conn, date_to_refetch, table, dt_col, BASE_FOLDER, CHUNK_SIZE)
+            if latest_day_is_current(conn, date_to_refetch, table, dt_col, BASE_FOLDER):
+                print(f"\n--- LATEST DAY {date_to_refetch.strftime('%Y-%m-%d')} MATCHES THE DATABASE, SKIPPING REFETCH ---")
+            else:
+                print(f"\n--- REFETCHING LATEST DAY: {date_to_refetch.strftime('%Y-%m-%d')} ---")
+                _process_single_day(conn, date_to_refetch, table, dt_col, BASE_FOLDER, CHUNK_SIZE)
             current_date_for_loop = date_to_refetch + timedelta(days=1)
 
         # --- START DAY-BY-DAY WALKING LOOP ---
@@ -299,23 +452,30 @@ def main():
 
         print(f"\n--- Starting incremental walk from {current_date_for_loop.strftime('%Y-%m-%d')} up to {max_db_date.strftime('%Y-%m-%d')} ---")
         
-        # Loop indefinitely until we pass the max date in the database.
+        # Collect every day up to the max date in the database.
+        days_to_process = []
         while True:
             if current_date_for_loop > max_db_date:
                 print(f"Stopping: current date {current_date_for_loop} has passed the max date found in the database ({max_db_date}).")
                 break
-
-            print(f"Checking for day: {current_date_for_loop.strftime('%Y-%m-%d')}")
-            rows_written = _process_single_day(conn, current_date_for_loop, table, dt_col, BASE_FOLDER, CHUNK_SIZE)
-
-            if rows_written > 0:
-                days_written_this_session.add(current_date_for_loop)
-                total_extracted_this_session += rows_written
-                # The following log is still useful to see progress
-                print(f"Found new day with data. Total distinct days found this session: {len(days_written_this_session)}")
-
+            days_to_process.append(current_date_for_loop)
             current_date_for_loop += timedelta(days=1)
 
+        # Each window of days is fetched with one range query, and each day writes its own
+        # parquet file, so windows can be fetched in parallel on pooled connections.
+        windows = [days_to_process[i:i + DAYS_PER_QUERY] for i in range(0, len(days_to_process), DAYS_PER_QUERY)]
+        with ThreadPoolExecutor(max_workers=DAY_WORKERS) as executor:
+            results = executor.map(lambda days: _process_days_pooled(pool, days, table, dt_col, BASE_FOLDER, CHUNK_SIZE), windows)
+            for window, window_rows in zip(windows, results):
+                for day in window:
+                    print(f"Checked day: {day.strftime('%Y-%m-%d')}")
+                    rows_written = window_rows.get(day.strftime('%Y-%m-%d'), 0)
+                    if rows_written > 0:
+                        days_written_this_session.add(day)
+                        total_extracted_this_session += rows_written
+                        # The following log is still useful to see progress
+                        print(f"Found new day with data. Total distinct days found this session: {len(days_written_this_session)}")
+
         elapsed = time.time() - session_start_time
         print(f"\nIncremental run finished. Extracted {total_extracted_this_session} rows for {len(days_written_this_session)} new days in {elapsed:.2f}s.")
 
@@ -112,40 +112,118 @@ if [[ ${#files[@]} -eq 0 ]]; then
     exit 1
 fi
 
-# Process files one at a time with progress
-total_files=${#files[@]}
-current_file=0
-for file in "${files[@]}"; do
-    ((current_file++))
-    echo "Processing file $current_file/$total_files: $file" >&2
+# A binlog last modified before the window starts holds no events inside it, so it is
+# skipped without running mysqlbinlog. The day of margin covers any difference between
+# the UTC+2 window and the server's local time. The index lists binlogs oldest first and
+# a rotated binlog is never written again, so mtimes rise along the index and the first
+# recent file is found by bisection, comparing against a reference file with the shell's
+# own -ot test instead of stat'ing every file.
+MIN_MTIME=$(( $(TZ=UTC-2 date -d "$START_DATETIME" +%s) - 86400 ))
+MTIME_REF=$(mktemp)
+touch -d "@${MIN_MTIME}" "$MTIME_REF"
+lo=0
+hi=${#files[@]}
+while (( lo < hi )); do
+    mid=$(( (lo + hi) / 2 ))
+    if [[ "${files[mid]}" -ot "$MTIME_REF" ]]; then
+        lo=$(( mid + 1 ))
+    else
+        hi=$mid
+    fi
+done
+rm -f "$MTIME_REF"
+echo "Skipping $lo binlog files last modified before the window"
+files=("${files[@]:lo}")
+
+# Decodes one binlog file into the row images of api_data_timeseries, written to $2.
+decode_binlog() {
+    # DECODE-ROWS prints only the ### row images, not the base64 BINLOG blobs awk would discard.
     mysqlbinlog --verbose \
+      --base64-output=DECODE-ROWS \
       --start-datetime="$START_DATETIME" \
       --stop-datetime="$STOP_DATETIME" \
-      "$file" \
-      | awk '
-        /^### (INSERT INTO|UPDATE|DELETE FROM) `enexory`.`api_data_timeseries`/ {
-            in_stmt=1;
-            gsub(/^### /,"");
-            print;
-            next
-        }
-        in_stmt {
-            if ($0 ~ /^###/) {
-                gsub(/^### /,"");
-                print
-            } else {
-                in_stmt=0
-            }
-        }
-      ' | ./consolidate || {
-        echo "Error: Failed processing $file" >&2
-        exit 1
+      "$1" | awk '
+    # Most of mysqlbinlog output is event headers and metadata; a prefix test
+    # drops those lines, and ends any open row image, before any regex runs.
+    # Every line past it starts with "###", so the "### " prefix is cut off with
+    # substr rather than a regex substitution.
+    index($0, "###") != 1 {
+        in_stmt=0;
+        next
     }
-done
+    /^### (INSERT INTO|UPDATE|DELETE FROM) `enexory`.`api_data_timeseries`/ {
+        in_stmt=1;
+        print substr($0, 5);
+        next
+    }
+    in_stmt {
+        print substr($0, 5)
+    }
+  ' > "$2"
+}
+
+# Binlog files are independent, so a few are decoded at a time into DECODE_DIR.
+# Their outputs are fed, strictly in index order, to a single consolidate process as
+# each one finishes. Events therefore still apply in binlog order, and each day's
+# parquet file is rewritten once instead of once per binlog file.
+# Each output holds only the api_data_timeseries row images of one binlog file, and at
+# most MAX_DECODE_JOBS of them exist at once; each is deleted as soon as it has been fed.
+DECODE_DIR=$(mktemp -d)
+trap 'rm -rf "$DECODE_DIR"' EXIT
+export -f decode_binlog
+export START_DATETIME STOP_DATETIME
+MAX_DECODE_JOBS=$(nproc)
+(( MAX_DECODE_JOBS > 4 )) && MAX_DECODE_JOBS=4
+total_files=${#files[@]}
+set -o pipefail
+{
+    decode_pids=()
+    next_out=0
+
+    # Kills every decode job that has not been fed to consolidate yet.
+    kill_decoders() {
+        local pid
+        for pid in "${decode_pids[@]:next_out}"; do
+            kill -- "-$pid" 2>/dev/null
+        done
+    }
+    trap kill_decoders EXIT
+
+    # Waits for the next file in index order and passes its rows on to consolidate.
+    emit_next() {
+        if ! wait "${decode_pids[next_out]}"; then
+            echo "Error: mysqlbinlog failed on ${files[next_out]}" >&2
+            exit 1
+        fi
+        cat "${DECODE_DIR}/${next_out}" || exit 1
+        rm -f "${DECODE_DIR}/${next_out}"
+        ((next_out++))
+    }
+
+    for i in "${!files[@]}"; do
+        echo "Processing file $((i + 1))/$total_files: ${files[i]}" >&2
+        # setsid makes each decode its own process group, so killing a job also stops its mysqlbinlog and awk.
+        setsid bash -o pipefail -c 'decode_binlog "$1" "$2"' _ "${files[i]}" "${DECODE_DIR}/${i}" &
+        decode_pids[i]=$!
+        if (( i + 1 - next_out >= MAX_DECODE_JOBS )); then
+            emit_next
+        fi
+    done
+    while (( next_out < total_files )); do
+        emit_next
+    done
+} | ./consolidate || {
+    echo "Error: Failed processing binlog files" >&2
+    exit 1
+}
 
 echo "Binlog processing complete. Starting rsync to destination..."
 
-rsync -avz --checksum --delete -e "ssh -i ${RSYNC_SSH_KEY}" "${RSYNC_SOURCE_DIR}" "${RSYNC_DEST_HOST}:${RSYNC_DEST_DIR}" || {
+# Day files are only ever replaced whole by a rename, so a changed file always has a new
+# mtime and rsync's size+mtime check finds it without reading every file on both ends.
+# Parquet pages are already Zstd-compressed, so rsync does not compress them again.
+# In-progress or crashed writers' *.parquet.tmp.<pid> files are never mirrored.
+rsync -av --delete --exclude='*.tmp*' -e "ssh -i ${RSYNC_SSH_KEY}" "${RSYNC_SOURCE_DIR}" "${RSYNC_DEST_HOST}:${RSYNC_DEST_DIR}" || {
     echo "Error: rsync failed to sync data to the destination." >&2
     exit 1
 }
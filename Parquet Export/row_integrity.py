@@ -1,8 +1,10 @@
 import os
 import mysql.connector
 import fastparquet
-import glob
+import json
 import argparse
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 def parse_conn_string(conn_str):
     """Parses a semicolon-separated connection string into a dict."""
@@ -11,10 +13,41 @@ def parse_conn_string(conn_str):
     kv["port"] = int(kv.get("port", 3306))
     return kv
 
+def load_row_count_cache(cache_path):
+    """Loads the {path: [mtime_ns, size, rows]} footer cache, or an empty one if it is missing or unreadable."""
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_row_count_cache(cache_path, cache):
+    """Writes the footer cache atomically so an interrupted run never leaves a half-written file."""
+    tmp_path = cache_path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not save row count cache: {e}")
+
+def count_parquet_rows(entry, cache):
+    """Returns the row count from the file footer, reusing the cached count while mtime and size are unchanged."""
+    st = entry.stat()
+    key = [st.st_mtime_ns, st.st_size]
+    cached = cache.get(entry.path)
+    if cached and cached[:2] == key:
+        return cached[2]
+    rows = fastparquet.ParquetFile(entry.path).count()
+    cache[entry.path] = key + [rows]
+    return rows
+
 def main():
     """
-    Compares the total row count in all Parquet files in PARQUET_FOLDER
-    against the total row count in the MySQL table.
+    Compares the row count in all Parquet files in PARQUET_FOLDER against
+    the MySQL table up to the latest exported day, and lists the days whose
+    counts diverge.
     """
     # --- Argument Parser ---
     parser = argparse.ArgumentParser(description="Compare Parquet and MySQL row counts.")
@@ -25,14 +58,34 @@ def main():
     TABLE_NAME = "api_data_timeseries"
     PARQUET_FOLDER = "/root/data"
     ENV_VAR_CONN_STRING = "MYSQL_CONN_STRING"
+    # Kept outside PARQUET_FOLDER, which is mirrored to the backup host.
+    ROW_COUNT_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "row_integrity_counts.json")
+    FOOTER_READ_WORKERS = 16
+    MAX_REPORTED_DAYS = 50
+    # The extractor writes rows without a valid date_time to this day's file.
+    INVALID_DT_DAY = "0001-01-01"
 
-    files = glob.glob(os.path.join(PARQUET_FOLDER, "*.parquet"))
+    with os.scandir(PARQUET_FOLDER) as it:
+        files = [entry for entry in it if entry.name.endswith(".parquet") and entry.is_file()]
     if not files:
         print("No Parquet files found. Exiting.")
         return
 
+    days = []
+    for entry in files:
+        try:
+            days.append(datetime.strptime(entry.name[:-len(".parquet")], "%Y-%m-%d"))
+        except ValueError:
+            continue
+    if not days:
+        print("No dated Parquet files found. Exiting.")
+        return
+    # A literal upper bound lets MySQL range-scan the date_time index instead of evaluating DATE_ADD per query.
+    boundary = (max(days) + timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S")
+
     # --- 1. Get Database Total Count ---
     db_total_rows = 0
+    db_day_rows = None
     if args.manual_db_count is not None:
         db_total_rows = args.manual_db_count
     else:
@@ -45,8 +98,15 @@ def main():
 
             conn = mysql.connector.connect(**parse_conn_string(conn_str))
             cursor = conn.cursor()
-            cursor.execute(f"SELECT COUNT(*) FROM `{TABLE_NAME}`")
-            db_total_rows = cursor.fetchone()[0]
+            cursor.execute(
+                f"SELECT DATE(date_time) AS d, COUNT(*) FROM `{TABLE_NAME}` WHERE date_time < %s OR date_time IS NULL GROUP BY d",
+                (boundary,)
+            )
+            db_day_rows = {}
+            for d, n in cursor.fetchall():
+                day = INVALID_DT_DAY if d is None else str(d)
+                db_day_rows[day] = db_day_rows.get(day, 0) + n
+            db_total_rows = sum(db_day_rows.values())
 
         except Exception as e:
             print(f"Error connecting to or querying the database: {e}")
@@ -65,7 +125,13 @@ def main():
 
     # --- 2. Get Parquet Total Rows ---
     try:
-        parquet_total_rows = sum(fastparquet.ParquetFile(f).count() for f in files)
+        row_count_cache = load_row_count_cache(ROW_COUNT_CACHE)
+        # Footer reads are small random I/O, so they overlap well across threads.
+        with ThreadPoolExecutor(max_workers=FOOTER_READ_WORKERS) as executor:
+            file_rows = list(executor.map(lambda f: count_parquet_rows(f, row_count_cache), files))
+        parquet_total_rows = sum(file_rows)
+        parquet_day_rows = {f.name[:-len(".parquet")]: rows for f, rows in zip(files, file_rows)}
+        save_row_count_cache(ROW_COUNT_CACHE, {f.path: row_count_cache[f.path] for f in files})
     except Exception as e:
         print(f"Error processing Parquet files: {e}")
         return
@@ -82,6 +148,18 @@ def main():
     print(f"Difference:         {sign}{abs(diff)}  (+ means more rows in parquet)")
     print("-" * 40)
 
+    if db_day_rows is not None:
+        mismatched = sorted(
+            day for day in db_day_rows.keys() | parquet_day_rows.keys()
+            if db_day_rows.get(day, 0) != parquet_day_rows.get(day, 0)
+        )
+        print(f"Days With Mismatch: {len(mismatched)}")
+        for day in mismatched[:MAX_REPORTED_DAYS]:
+            print(f"  {day}: parquet={parquet_day_rows.get(day, 0)} db={db_day_rows.get(day, 0)}")
+        if len(mismatched) > MAX_REPORTED_DAYS:
+            print(f"  ... {len(mismatched) - MAX_REPORTED_DAYS} more")
+        print("-" * 40)
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file